@@ -1,6 +1,12 @@
-import pickle
-from collections import UserDict
-from datetime import datetime, timedelta
+import calendar
+import json
+import os
+import re
+import sys
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from functools import lru_cache, wraps
+from types import MappingProxyType
 from abc import ABC, abstractmethod
 
 class View(ABC):
@@ -17,24 +23,41 @@ class View(ABC):
         pass
 
 class ConsoleView(View):
+    def __init__(self):
+        # Non-interactive output (pipes, files) bypasses the text I/O layer.
+        self._stdout = sys.stdout
+        try:
+            self._stdout_fd = None if sys.stdout.isatty() else sys.stdout.fileno()
+        except (AttributeError, OSError, ValueError):
+            self._stdout_fd = None
+
     def display_message(self, message: str):
-        print(message)
+        # Fall back to print if sys.stdout has been redirected since init.
+        if self._stdout_fd is None or sys.stdout is not self._stdout:
+            print(message)
+            return
+        # Keep ordering with prompts and listings written through sys.stdout.
+        sys.stdout.flush()
+        data = f"{message}\n".encode(sys.stdout.encoding or "utf-8", sys.stdout.errors or "strict")
+        while data:
+            data = data[os.write(self._stdout_fd, data):]
 
     def display_contacts(self, contacts: list):
         if not contacts:
-            print("No contacts found.")
+            sys.stdout.write("No contacts found.\n")
         else:
-            for contact in contacts:
-                print(contact)
+            sys.stdout.write("\n".join(contacts) + "\n")
 
     def display_help(self, commands: dict):
-        print("Available commands:")
-        for command, description in commands.items():
-            print(f"{command}: {description}")
+        lines = ["Available commands:"]
+        lines.extend(f"{command}: {description}" for command, description in commands.items())
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 
 class Field:
+    __slots__ = ("value",)
+
     def __init__(self, value):
         self.value = value
 
@@ -43,109 +66,325 @@ class Field:
 
 
 class Name(Field):
-    pass
+    __slots__ = ()
+
+    def __init__(self, value):
+        super().__init__(sys.intern(value))
 
 
 class Phone(Field):
+    __slots__ = ()
+
+    _PHONE_RE = re.compile(r"\d{10}")
+
     def __init__(self, value):
         if not self.is_valid(value):
             raise ValueError("Invalid phone number. Should contain 10 digits.")
-        super().__init__(value)
+        super().__init__(sys.intern(value))
 
     @staticmethod
     def is_valid(value):
-        return value.isdigit() and len(value) == 10
+        return Phone._PHONE_RE.fullmatch(value) is not None
+
+    @classmethod
+    def _trusted(cls, value):
+        # Skips validation for values the caller has already checked.
+        phone = cls.__new__(cls)
+        phone.value = sys.intern(value)
+        return phone
+
+
+@lru_cache(maxsize=4096)
+def _parse_bday(value):
+    return datetime.strptime(value, "%d.%m.%Y").date()
 
 
 class Birthday(Field):
+    __slots__ = ("date", "month_day")
+
     def __init__(self, value):
-        if not self.is_valid(value):
-            raise ValueError("Invalid date format. Use DD.MM.YYYY.")
+        try:
+            self.date = _parse_bday(value)
+        except ValueError:
+            raise ValueError("Invalid date format. Use DD.MM.YYYY.") from None
+        self.month_day = (self.date.month, self.date.day)
         super().__init__(value)
 
     @staticmethod
     def is_valid(value):
         try:
-            datetime.strptime(value, "%d.%m.%Y")
+            _parse_bday(value)
             return True
         except ValueError:
             return False
 
 
 class Record:
+    __slots__ = ("name", "phones", "birthday", "book", "_str_cache")
+
     def __init__(self, name):
         self.name = Name(name)
-        self.phones = []
+        self.phones = {}
         self.birthday = None
+        self.book = None
+        self._str_cache = None
+
+    def _changed(self):
+        self._str_cache = None
+        if self.book is not None:
+            self.book._dirty = True
 
     def add_phone(self, phone):
-        self.phones.append(Phone(phone))
+        phone_obj = Phone(phone)
+        self.phones[phone_obj.value] = phone_obj
+        self._changed()
+
+    def add_phones(self, phones):
+        phones = list(phones)
+        match = Phone._PHONE_RE.fullmatch
+        if not all(match(phone) for phone in phones):
+            raise ValueError("Invalid phone number. Should contain 10 digits.")
+        self.phones.update((p.value, p) for p in map(Phone._trusted, phones))
+        self._changed()
 
     def remove_phone(self, phone):
-        phone_obj = self.find_phone(phone)
-        if phone_obj:
-            self.phones.remove(phone_obj)
-        else:
+        if self.phones.pop(phone, None) is None:
             raise ValueError("The phone is absent")
+        self._changed()
 
     def edit_phone(self, old_phone, new_phone):
-        if not Phone.is_valid(new_phone):
-            raise ValueError("Invalid number. Should contain 10 digits.")
+        new_phone_obj = Phone(new_phone)
         phone_obj = self.find_phone(old_phone)
         if phone_obj:
             self.remove_phone(old_phone)
-            self.add_phone(new_phone)
+            self.phones[new_phone_obj.value] = new_phone_obj
+            self._changed()
             return f"Phone number updated: {old_phone} -> {new_phone}" 
         else:
             raise ValueError("The old phone is not found")
 
     def find_phone(self, phone):
-        for p in self.phones:
-            if p.value == phone:
-                return p
-        return None
+        return self.phones.get(phone)
 
     def add_birthday(self, birthday):
-        self.birthday = Birthday(birthday)
+        new_birthday = Birthday(birthday)
+        if self.book is not None:
+            self.book.unindex_birthday(self)
+        self.birthday = new_birthday
+        if self.book is not None:
+            self.book.index_birthday(self)
+        self._changed()
 
     def show_birthday(self):
         return self.birthday.value if self.birthday else "Birthday not set."
 
+    @classmethod
+    def from_columns(cls, name, phones, birthday):
+        record = cls(name)
+        record.add_phones(phones)
+        if birthday is not None:
+            record.add_birthday(birthday)
+        return record
+
     def __str__(self):
-        phones = ', '.join(p.value for p in self.phones)
-        birthday = self.show_birthday()
-        return f"{self.name.value}: {phones}; Birthday: {birthday}"
+        if self._str_cache is None:
+            phones = ', '.join(p.value for p in self.phones.values())
+            birthday = self.show_birthday()
+            self._str_cache = f"{self.name.value}: {phones}; Birthday: {birthday}"
+        return self._str_cache
+
 
+HELP_COMMANDS = MappingProxyType({
+    "add": "Add a new contact",
+    "change": "Change an existing contact",
+    "phone": "Show phones of a contact",
+    "all": "Show all contacts",
+    "add-birthday": "Add a birthday to a contact",
+    "show-birthday": "Show the birthday of a contact",
+    "birthdays": "Show upcoming birthdays",
+})
 
-class AddressBook(UserDict):
+
+class AddressBook(dict):
     def __init__(self, view=None):
         super().__init__()
         self.view = view or ConsoleView()
+        # Parallel sorted columns for range queries on birthdays: encoded
+        # (month, day) keys and the contact names they belong to.
+        self._bday_keys = []
+        self._bday_names = []
+        # Set on any change since the last save or load.
+        self._dirty = False
+
+    # Every mutation of the mapping goes through __setitem__/__delitem__ (or
+    # the batched _insert_records) so the birthday index, Record.book and
+    # the dirty flag stay in sync with the stored records.
+    def _attach(self, record):
+        record.book = self
+        self.index_birthday(record)
+
+    def _detach(self, record):
+        self.unindex_birthday(record)
+        record.book = None
+
+    def __setitem__(self, name, record):
+        old_record = self.get(name)
+        if old_record is not None:
+            self._detach(old_record)
+        super().__setitem__(name, record)
+        self._attach(record)
+        self._dirty = True
+
+    def __delitem__(self, name):
+        record = self[name]
+        super().__delitem__(name)
+        self._detach(record)
+        self._dirty = True
+
+    def pop(self, name, *default):
+        if name not in self:
+            if default:
+                return default[0]
+            raise KeyError(name)
+        record = self[name]
+        del self[name]
+        return record
+
+    def popitem(self):
+        if not self:
+            raise KeyError("popitem(): dictionary is empty")
+        name = next(reversed(self))
+        return name, self.pop(name)
+
+    def setdefault(self, name, default=None):
+        if name not in self:
+            self[name] = default
+        return self[name]
+
+    def update(self, *args, **kwargs):
+        for name, record in dict(*args, **kwargs).items():
+            self[name] = record
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        if not self:
+            return
+        for record in self.values():
+            record.book = None
+        super().clear()
+        self._bday_keys.clear()
+        self._bday_names.clear()
+        self._dirty = True
 
     def add_record(self, record):
-        self.data[record.name.value] = record
+        self[record.name.value] = record
         self.view.display_message(f"Contact {record.name.value} added successfully!")
 
+    def add_records(self, records):
+        count = self._insert_records(records)
+        self.view.display_message(f"{count} contacts added successfully!")
+
+    def _insert_records(self, records):
+        records = {record.name.value: record for record in records}
+        for name, record in records.items():
+            old_record = self.get(name)
+            if old_record is not None:
+                self._detach(old_record)
+            self._attach(record)
+        super().update(records)
+        self._dirty = True
+        return len(records)
+
+    def to_dict(self):
+        # Stored column-wise: one list per field, aligned by position.
+        records = self.values()
+        return {
+            "names": [record.name.value for record in records],
+            "phones": [list(record.phones) for record in records],
+            "birthdays": [record.birthday.value if record.birthday else None for record in records],
+        }
+
+    @classmethod
+    def from_dict(cls, data, view=None):
+        if {"names", "phones", "birthdays"} <= data.keys():
+            records = map(Record.from_columns, data["names"], data["phones"], data["birthdays"])
+        elif "records" in data:
+            # Row-wise layout written before the columnar format.
+            records = (
+                Record.from_columns(row["name"], row["phones"], row["birthday"])
+                for row in data["records"]
+            )
+        else:
+            raise ValueError("Unrecognized address book file format.")
+        book = cls(view=view)
+        book._insert_records(records)
+        book._dirty = False
+        return book
+
     def find(self, name):
-        return self.data.get(name)
+        return self.get(sys.intern(name))
 
     def show_all(self):
-        if not self.data:
+        if not self:
             self.view.display_message("No contacts found.")
         else:
-            self.view.display_contacts([str(record) for record in self.data.values()])
+            self.view.display_contacts([str(record) for record in self.values()])
         
-    def get_upcoming_birthdays(self):
-        today = datetime.today()
-        upcoming_birthdays = []
-
-        for record in self.data.values():
-            if record.birthday:
-                bday = datetime.strptime(record.birthday.value, "%d.%m.%Y")
-                this_year_bday = bday.replace(year=today.year)
+    @staticmethod
+    def _bday_key(month, day):
+        return month * 32 + day
+
+    def index_birthday(self, record):
+        if record.birthday:
+            key = self._bday_key(*record.birthday.month_day)
+            lo = bisect_left(self._bday_keys, key)
+            hi = bisect_right(self._bday_keys, key, lo)
+            i = bisect_left(self._bday_names, record.name.value, lo, hi)
+            self._bday_keys.insert(i, key)
+            self._bday_names.insert(i, record.name.value)
+
+    def unindex_birthday(self, record):
+        if record.birthday:
+            key = self._bday_key(*record.birthday.month_day)
+            lo = bisect_left(self._bday_keys, key)
+            hi = bisect_right(self._bday_keys, key, lo)
+            i = bisect_left(self._bday_names, record.name.value, lo, hi)
+            if i < hi and self._bday_names[i] == record.name.value:
+                del self._bday_keys[i]
+                del self._bday_names[i]
+
+    def _bday_range(self, year, start, stop):
+        lo = bisect_left(self._bday_keys, start)
+        hi = bisect_left(self._bday_keys, stop, lo)
+        return [(year, *divmod(self._bday_keys[i], 32), self._bday_names[i]) for i in range(lo, hi)]
+
+    def get_upcoming_birthdays(self, days=7):
+        today = date.today()
+        end = today + timedelta(days=days)
+        start_key = self._bday_key(today.month, today.day)
+        stop_key = self._bday_key(end.month, end.day) + 1
+        if (end.month, end.day) == (2, 28) and not calendar.isleap(end.year):
+            # 29 February birthdays fall on the 28th in non-leap years.
+            stop_key = self._bday_key(2, 29) + 1
+
+        if start_key < stop_key:
+            entries = self._bday_range(today.year, start_key, stop_key)
+        else:
+            # The window wraps past New Year's Eve.
+            entries = self._bday_range(today.year, start_key, self._bday_key(13, 0))
+            entries += self._bday_range(end.year, 0, stop_key)
 
-                if 0 <= (this_year_bday - today).days <= 7:
-                    upcoming_birthdays.append(f"{record.name.value}: {this_year_bday.strftime('%d.%m.%Y')}")
+        upcoming_birthdays = []
+        for year, month, day, name in entries:
+            try:
+                this_year_bday = date(year, month, day)
+            except ValueError:
+                # 29 February in a non-leap year.
+                this_year_bday = date(year, 2, 28)
+            upcoming_birthdays.append(f"{name}: {this_year_bday.strftime('%d.%m.%Y')}")
 
         if not upcoming_birthdays:
             return "No birthdays in the next week."
@@ -153,45 +392,52 @@ class AddressBook(UserDict):
         return "\n".join(upcoming_birthdays)
 
     def show_help(self):
-        commands = {
-            "add": "Add a new contact",
-            "change": "Change an existing contact",
-            "phone": "Show phones of a contact",
-            "all": "Show all contacts",
-            "add-birthday": "Add a birthday to a contact",
-            "show-birthday": "Show the birthday of a contact",
-            "birthdays": "Show upcoming birthdays",
-        }
-        self.view.display_help(commands)
+        self.view.display_help(HELP_COMMANDS)
 
 
-def save_data(book, filename="addressbook.pkl"):
-    with open(filename, "wb") as f:
-        pickle.dump(book, f)
+def save_data(book, filename="addressbook.json"):
+    if not book._dirty:
+        return
+    # ASCII escapes keep lone surrogates from undecodable input round-tripping.
+    payload = json.dumps(book.to_dict(), separators=(",", ":")).encode("ascii")
+    tmp = filename + ".tmp"
+    try:
+        with open(tmp, "wb", buffering=1 << 20) as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, filename)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+    book._dirty = False
 
 
-def load_data(filename="addressbook.pkl"):
+def load_data(filename="addressbook.json"):
     try:
-        with open(filename, "rb") as f:
-            return pickle.load(f)
+        with open(filename, "rb", buffering=1 << 20) as f:
+            return AddressBook.from_dict(json.loads(f.read()))
     except FileNotFoundError:
         return AddressBook()
 
 
-def input_error(func):
-    def wrapper(*args, **kwargs):
-        try:
-            return func(*args, **kwargs)
-        except IndexError:
-            return "Error: Not enough arguments."
-        except KeyError as e:
-            return f"Error: {e}"
-        except ValueError as e:
-            return f"Error: {e}"
-    return wrapper
+# Returns `message` (or the exception text) for the listed exceptions.
+def input_error(*exceptions, message=None):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except exceptions as e:
+                return message if message is not None else f"Error: {e}"
+        return wrapper
+    return decorator
 
 
-@input_error
+@input_error(ValueError)
 def add_contact(args, book):
     name, phone, *_ = args
     record = book.find(name)
@@ -205,7 +451,7 @@ def add_contact(args, book):
     return message
 
 
-@input_error
+@input_error(ValueError)
 def change_contact(args, book):
     name, old_phone, new_phone = args
     record = book.find(name)
@@ -215,17 +461,17 @@ def change_contact(args, book):
         return f"Error: contact '{name}' not found."
 
 
-@input_error
+@input_error(IndexError, message="Error: Not enough arguments.")
 def show_phone(args, book):
     name = args[0]
     record = book.find(name)
     if record:
-        return f"{name}: {', '.join(phone.value for phone in record.phones)}"
+        return f"{name}: {', '.join(phone.value for phone in record.phones.values())}"
     else:
         return f"Error: contact '{name}' not found."
 
 
-@input_error
+@input_error(ValueError)
 def add_birthday(args, book):
     name, birthday = args
     record = book.find(name)
@@ -236,7 +482,7 @@ def add_birthday(args, book):
         return f"Error: contact '{name}' not found."
 
 
-@input_error
+@input_error(IndexError, message="Error: Not enough arguments.")
 def show_birthday(args, book):
     name = args[0]
     record = book.find(name)
@@ -246,15 +492,26 @@ def show_birthday(args, book):
         return f"Error: contact '{name}' not found."
 
 
-@input_error
 def birthdays(args, book):
     return book.get_upcoming_birthdays()
 
 
+DISPATCH = {
+    "add": add_contact,
+    "change": change_contact,
+    "phone": show_phone,
+    "add-birthday": add_birthday,
+    "show-birthday": show_birthday,
+    "birthdays": birthdays,
+}
+
+
 def parse_input(user_input):
-    cmd, *args = user_input.split()
-    cmd = cmd.strip().lower()
-    return cmd, args
+    # No command takes more than three arguments.
+    parts = user_input.strip().split(maxsplit=3)
+    if not parts:
+        return "", []
+    return parts[0].lower(), parts[1:]
 
 
 def main():
@@ -266,26 +523,17 @@ def main():
         user_input = input("Enter a command: ")
         command, args = parse_input(user_input)
 
-        if command in ["close", "exit"]:
+        handler = DISPATCH.get(command)
+        if handler:
+            view.display_message(handler(args, book))
+        elif command in ["close", "exit"]:
             view.display_message("Good bye!")
             save_data(book)
             break
         elif command == "hello":
             view.display_message("How can I help you?")
-        elif command == "add":
-            view.display_message(add_contact(args, book))
-        elif command == "change":
-            view.display_message(change_contact(args, book))
-        elif command == "phone":
-            view.display_message(show_phone(args, book))
         elif command == "all":
             book.show_all()
-        elif command == "add-birthday":
-            view.display_message(add_birthday(args, book))
-        elif command == "show-birthday":
-            view.display_message(show_birthday(args, book))
-        elif command == "birthdays":
-            view.display_message(birthdays(args, book))
         elif command == "help":
             book.show_help()
         else: